@@ -6,13 +6,15 @@ get_config_value(config_key, filename=None, suppress_key_not_found=False)
     Scan a configuration file for the provided key, and returns the value(s) of that key.
 #is_billed_service(service_name)
 #    Determine if the specified service is a billed service ().
+licensed_services()
+    Return a tuple of the licensed service names from LICENSED_SERVICES (cached for the life of the process).
 licensed_service
     Indicate if the specified service is licensed (i.e., begins with one of the names in LICENSED_SERVICES).
 vcap_service_present(service_name)
     Determine if the specified service is present in VCAP_SERVICES.
 get_service_from_vcap_services(service_name)
     Retrieve the credentials for the specified service from VCAP_SERVICES.
-days_in_month(month_string)
+days_in_month(month_string, year=None)
     Provide the number of days in a numeric month, e.g. returns 31 for 3 (March).
 get_total_from_csv
     Return the sum of the values in the key_column field of the file specified by csv_filename.
@@ -41,26 +43,58 @@ CsvWriter
 """
 
 import os
-import json
+import csv
 import datetime
+import functools
 import shutil
+import stat
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import zip_longest
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.client import Config
 from botocore.exceptions import ClientError
 import re
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional; fall back to the standard library decoder
+    from json import loads as json_loads
+try:
+    import pandas as pd
+except ImportError:  # pandas is optional; get_total_from_csv falls back to CsvReader without it
+    pd = None
+
+# Larger connection pool than the boto3 default of 10, so concurrent S3 calls on the shared client reuse connections
+_S3_CONFIG = Config(max_pool_connections=50, retries={'max_attempts': 3, 'mode': 'standard'})
+
+# download_many already runs one download per thread, so each download must not start threads of its own;
+# this keeps the connections in use at max_workers, within the pool size above
+_S3_SINGLE_STREAM_CONFIG = TransferConfig(use_threads=False)
+
+# VCAP_SERVICES and VCAP_APPLICATION do not change for the life of the process, so parse them once
+_VCAP_SERVICES = json_loads(os.environ['VCAP_SERVICES']) if os.environ.get('VCAP_SERVICES') else None
+_VCAP_APPLICATION = json_loads(os.environ['VCAP_APPLICATION']) if os.environ.get('VCAP_APPLICATION') else None
+
+_RE_UNDERSCORE_DIGITS = re.compile(r'_\d+')
+_RE_DASH_DIGITS = re.compile(r'-\d+')
 
 
 def file_exists(filename):
-    return os.path.exists(filename) and os.path.isfile(filename)
+    """Indicate if filename is an existing regular file, using a single stat() call."""
+    try:
+        return stat.S_ISREG(os.stat(filename).st_mode)
+    except OSError:
+        return False
 
 
 def get_language(buildpack_name):
     """Determine the language used by the app based on the name of the buildpack."""
     # strip off trailing _n (as many times as it appears)
-    language = re.sub("_\d+", "", buildpack_name)
+    language = _RE_UNDERSCORE_DIGITS.sub('', buildpack_name)
 
     # strip off trailing -n (as many times as it appears)
-    language = re.sub("-\d+", "", language)
+    language = _RE_DASH_DIGITS.sub('', language)
 
     # if buildpack starts_with https://github.com/cloudfoundry/ :
     key = 'https://github.com/cloudfoundry/'
@@ -69,8 +103,8 @@ def get_language(buildpack_name):
         # strip off leading https://github.com/cloudfoundry/
         language = language[len(key):]
         #    Find -buildpack string in result; buildpack name is text up to -buildpack
-        pos = re.search("-buildpack", language)
-        return language[:pos.start()]
+        pos = language.find('-buildpack')
+        return language[:pos] if pos >= 0 else language
 
     # else if buildpack starts with https://github.com/heroku/heroku-buildpack-
     key = 'https://github.com/heroku/heroku-buildpack-'
@@ -79,8 +113,8 @@ def get_language(buildpack_name):
         # strip off leading https://github.com/heroku/heroku-buildpack-
         language = language[len(key):]
         #    Find .git string in result; buildpack name is text up to -buildpack
-        pos = re.search(".git", language)
-        return language[:pos.start()]
+        pos = language.find('.git')
+        return language[:pos] if pos >= 0 else language
 
     # else if buildpack starts with https://gitlab.gs.mil/ :
     #    buildpack name is "CUSTOM"
@@ -118,7 +152,7 @@ def get_useful_lines(filename):
 
     Useful lines are those that are not blank and not comments.  Trailing whitespace and newlines are removed.
     """
-    if not os.path.exists(filename) or not os.path.isfile(filename):
+    if not file_exists(filename):
         print('Could not find file:', filename)
         exit(1)
         # This test and exit was added to ensure that if the file is not present, it gets reported properly,
@@ -130,41 +164,64 @@ def get_useful_lines(filename):
                 yield line.rstrip()
 
 
+_CFG_CACHE = {}  # filename -> (mtime, parsed results) for config files already read by get_config_value
+
+
+def _parse_config_file(filename):
+    """Parse a configuration file and return a dictionary of all of its keys and values.
+
+    A key with a value on the same line is a scalar (string); a key with no value collects the indented lines
+    that follow it into a list.  Keys with no values at all are omitted.
+    """
+    results = {}
+    key = None
+    for line in get_useful_lines(filename):
+        stripped = line.strip()
+        if not stripped:  # skip blank lines
+            continue
+        # If this line contains the ':' character and is not indented, it contains a key, and possibly a value
+        if ':' in line and line[0] != ' ':
+            key, value = stripped.split(':', 1)
+            value = value.strip()
+            # If the value of the key was specified on this line it is a scalar, otherwise a list follows
+            results[key] = value if value else []
+        # Else this line only contains a value, which belongs to the list of the current key
+        elif key is not None and isinstance(results[key], list):
+            results[key].append(stripped)
+        else:
+            print('Found value', stripped, 'without a list key in', filename)
+            exit(1)
+    return {key: value for key, value in results.items() if len(value) > 0}
+
+
 def get_config_value(config_key, filename=None, suppress_key_not_found=False):
     """Scan a configuration file for the provided key, and returns the value(s) of that key.
 
     If the key is not found, an error message is printed and execution terminates, unless suppress_key_not_found is truthy.
     Uses a format very similar to yaml.  If no filename is specified, uses the filename PlatformChargeback.cfg.
+    The parsed file is cached, and only re-read if its modification time changes.
     """
     if filename is None:
         filename = "PlatformChargeback.cfg"
 
-    result = ""
-    results = {}
-    for line in get_useful_lines(filename):
-        # print(line)
-        # If this line contains the ':' character, it contains at least a key, and possibly a value
-        if ':' in line and not line.startswith(' '):
-            # If there is a previous result
-            if len(result) > 0:
-                results[key] = result
-                result = ""
-            key, value = line.strip().split(':', 1)
-            value = value.strip()
-            # If the value of the key was specified on this line
-            if len(value) > 0:
-                result = value
-            else:
-                result = []
-        # Else this line only contains a value
-        else:
-            result.append(line.strip())
-    # If there is a previous result
-    if len(result) > 0:
-        results[key] = result
-        result = ""
+    try:
+        file_stat = os.stat(filename)
+    except OSError:
+        file_stat = None
+    if file_stat is None or not stat.S_ISREG(file_stat.st_mode):
+        print('Could not find file:', filename)
+        exit(1)
+    mtime = file_stat.st_mtime
+    if filename in _CFG_CACHE and _CFG_CACHE[filename][0] == mtime:
+        results = _CFG_CACHE[filename][1]
+    else:
+        results = _parse_config_file(filename)
+        _CFG_CACHE[filename] = (mtime, results)
+
     if config_key in results:
-        return results[config_key]
+        value = results[config_key]
+        # return a copy of list values, so a caller changing its list does not change the cached one
+        return list(value) if isinstance(value, list) else value
     else:
         if suppress_key_not_found:
             return 0
@@ -173,47 +230,55 @@ def get_config_value(config_key, filename=None, suppress_key_not_found=False):
             exit()
 
 
+@functools.lru_cache(maxsize=1)
+def licensed_services():
+    """Return a tuple of the licensed service names from LICENSED_SERVICES (cached).
+
+    The result is cached for the life of the process, so unlike get_config_value, later edits to
+    LICENSED_SERVICES in PlatformChargeback.cfg are not picked up.  Call licensed_services.cache_clear() to re-read it.
+    """
+    services = get_config_value('LICENSED_SERVICES')
+    if isinstance(services, str):  # a single service specified on the key line
+        return (services,)
+    return tuple(services)
+
+
 def licensed_service(service_name):
     """Indicate if the specified service is licensed (i.e., begins with one of the names in LICENSED_SERVICES)."""
-    licensed = False
-    for licensed_service in get_config_value('LICENSED_SERVICES'):
-        if service_name.startswith(licensed_service):
-            licensed = True
-    return licensed
+    return service_name.startswith(licensed_services())
 
 
 def vcap_service_present(service_name):
     """Determine if the specified service is present in VCAP_SERVICES."""
-    if os.environ.get('VCAP_SERVICES') is not None:
-        env_vars = os.environ['VCAP_SERVICES']
-        env_vars_json = json.loads(env_vars)
-        if service_name in env_vars_json:
-            return True
-    return False
+    return _VCAP_SERVICES is not None and service_name in _VCAP_SERVICES
 
 
 def get_service_from_vcap_services(service_name):
     """Retrieve the attributes for the specified service from VCAP_SERVICES."""
-    env_vars = os.environ['VCAP_SERVICES']
-    env_vars_json = json.loads(env_vars)
-    if service_name not in env_vars_json:
+    if _VCAP_SERVICES is None or service_name not in _VCAP_SERVICES:
         print('No', service_name, 'service bound to app...exiting')
         exit()
-    return env_vars_json[service_name][0]
+    return _VCAP_SERVICES[service_name][0]
+
+
+_DAYS_IN_MONTH = (None, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)  # indexed by month number
 
 
-def days_in_month(month_string):
-    """Provide the number of days in a numeric month, e.g. returns 31 for 3 (March)."""
+def days_in_month(month_string, year=None):
+    """Provide the number of days in a numeric month, e.g. returns 31 for 3 (March).
+
+    If year is supplied, February of a leap year has 29 days; otherwise February always has 28.
+    """
     month = int(month_string)
-    if month == 4 or month == 6 or month == 9 or month == 11:
-        return 30
-    elif month == 2:
-        return 28
-    elif month < 1 or month > 12:
+    if month < 1 or month > 12:
         print('Invalid month of', month_string, 'specified in datestring')
         exit()
-    else:
-        return 31
+    days = _DAYS_IN_MONTH[month]
+    if month == 2 and year is not None:
+        year = int(year)
+        if (year % 4 == 0 and year % 100 != 0) or year % 400 == 0:
+            days = 29
+    return days
 
 
 def get_total_from_csv(csv_filename, key_column):
@@ -222,16 +287,32 @@ def get_total_from_csv(csv_filename, key_column):
     key_column can either be a single column, or x*y in order to generate a sum of the product of the values in the x and y columns
     """
     total = 0.0
+    columns = key_column.split('*')
+    if len(columns) > 2:
+        print('Invalid key column', key_column, '- at most two columns can be multiplied')
+        exit()
     with CsvReader(csv_filename) as csv_reader:
-        if not csv_reader.column_present(key_column):
-            print('Did not find column', key_column, 'in file', csv_filename)
-            exit()
-        for line in csv_reader.readlines():
-            if '*' in key_column:
-                words = key_column.split('*')
-                total += float(csv_reader.column(words[0])) * float(csv_reader.column(words[1]))
-            else:
-                total += float(csv_reader.column(key_column))
+        for column in columns:
+            if not csv_reader.column_present(column):
+                print('Did not find column', column, 'in file', csv_filename)
+                exit()
+        if pd is not None:  # sum with vectorized pandas/numpy operations rather than row by row
+            # empty/NA values must fail as they do in the loop below, not be skipped as NaN
+            data = pd.read_csv(csv_filename, usecols=columns, dtype='float64',
+                               keep_default_na=False, na_filter=False, float_precision='round_trip')
+            if len(columns) > 1:
+                return float((data[columns[0]] * data[columns[1]]).sum())
+            return float(data[key_column].sum())
+        # resolve the column positions once, then index each row directly
+        positions = [csv_reader.column_pos(column) for column in columns]
+        if len(positions) > 1:
+            (x_pos, y_pos) = positions
+            for row in csv_reader.rows():
+                total += float(row[x_pos]) * float(row[y_pos])
+        else:
+            key_pos = positions[0]
+            for row in csv_reader.rows():
+                total += float(row[key_pos])
     return total
 
 
@@ -243,11 +324,23 @@ def build_dict_from_csv(csv_filename, key_columns, value_columns):
     """
     result = {}
     with CsvReader(csv_filename) as csv_reader:
-        for line in csv_reader.readlines():
+        # resolve the column positions once, then index each row directly
+        key_list = type(key_columns) is list
+        value_list = type(value_columns) is list
+        if key_list:
+            key_positions = [csv_reader.column_pos(column) for column in key_columns]
+        else:
+            key_pos = csv_reader.column_pos(key_columns)
+        if value_list:
+            value_positions = [csv_reader.column_pos(column) for column in value_columns]
+        else:
+            value_pos = csv_reader.column_pos(value_columns)
+
+        for row in csv_reader.rows():
 
             # build the key
-            key = csv_reader.build_key(key_columns)
-            value = csv_reader.build_key(value_columns)
+            key = ','.join([row[pos] for pos in key_positions]) if key_list else row[key_pos]
+            value = ','.join([row[pos] for pos in value_positions]) if value_list else row[value_pos]
             result[key] = value
 
     return result
@@ -282,6 +375,29 @@ def find_line(search_line, lines):
     return ""
 
 
+def find_lines(search_texts, lines):
+    """Find the first line containing each of several search texts, in a single pass over the lines.
+
+    search_texts contains the texts to be searched for.
+    lines contains the lines to be searched (any iterable).
+    Returns a dictionary of search text to matching line; texts that were not found are omitted.
+    """
+    pending = set(search_texts)
+    found = {}
+    if not pending:
+        return found
+    # one regex alternation quickly rejects lines that contain none of the search texts
+    any_text = re.compile('|'.join(re.escape(text) for text in pending))
+    for line in lines:
+        if any_text.search(line):
+            for text in [text for text in pending if text in line]:
+                found[text] = line
+                pending.discard(text)
+            if not pending:
+                break
+    return found
+
+
 def get_data_from_file(filename, config_key):
     """Extract values from a file, as specified by the instructions in the config_key.
 
@@ -294,18 +410,17 @@ def get_data_from_file(filename, config_key):
     contains the desired data value.  y can be either a number (1-based)
     or the text "last" to indicate that the last word contains the desired data value.
     """
-    instructions = get_config_value(config_key)
+    instructions = [instruction.split(',') for instruction in get_config_value(config_key)]
 
-    # open the file and store in memory, since we'll need to process it once for each instruction
+    # scan the file once, finding the line for every instruction
     with S3Reader(filename, s3_only=True, suppress_file_not_found=True) as file:
         if file is None:
             return None
-        lines = file.readlines()
+        found = find_lines([search_text for (search_text, word) in instructions], file)
 
     results = []
-    for instruction in instructions:
-        (search_text, word) = instruction.split(',')
-        desired_line = find_line(search_text, lines)
+    for (search_text, word) in instructions:
+        desired_line = found.get(search_text, "")
         if desired_line == "":
             print('Could not find line containing', search_text, 'in file', filename)
             exit(1)
@@ -332,55 +447,50 @@ def build_idp_data():
     idp['authn_uri'] = uri + '/oauth/authorize'
     idp['token_uri'] = uri + '/oauth/token'
     idp['token_info_uri'] = uri + '/userinfo'
-    envs = dict(os.environ)
-    apps = json.loads(envs['VCAP_APPLICATION'])
-    app_uri = apps['uris'][0]
+    app_uri = _VCAP_APPLICATION['uris'][0]
     idp['return_uri'] = 'https://' + app_uri + '/oauthcallback'
     return idp
 
 
 def generate_csv(csv_filename, record_list, column_list, generate_totals=None):
     """Generate a csv file using the supplied record_list and formatting according to the provided column_list."""
-    with S3Writer(csv_filename) as file:
-
-        totals = defaultdict(float)  # dictionary of totals of float fields
-
-        # write out the header
-        for column in column_list:
-            (column_name, column_heading, column_type) = column
-            print(column_heading, end='', file=file)
+    # unpack the column definitions once, rather than for every cell
+    names = [column[0] for column in column_list]
+    headings = [column[1] for column in column_list]
+    is_float = [column[2] == 'float' for column in column_list]
+    float_indexes = [index for index, float_column in enumerate(is_float) if float_column]
+    line_format = ','.join('%.2f' if float_column else '%s' for float_column in is_float) + '\n'
 
-            if column != column_list[-1]:  # if not last column
-                print(',', end='', file=file)
-            else:  # last column
-                print('', file=file)
+    totals = defaultdict(float)  # dictionary of totals of float fields
 
+    def formatted_lines():
+        """Format each record as a line of the csv file, accumulating the totals (generator)."""
         for record in record_list:
-            for column in column_list:
-                (column_name, column_heading, column_type) = column
+            values = [record[name] for name in names]
+            for index in float_indexes:
+                value = float(values[index])
+                values[index] = value
+                totals[names[index]] += value
+            yield line_format % tuple(values)
 
-                if column_type == 'float':
-                    print("%.2f" % float(record[column_name]), end='', file=file)
-                    totals[column_name] += float(record[column_name])
-                else:
-                    print("%s" % record[column_name], end='', file=file)
+    with S3Writer(csv_filename) as file:
 
-                if column != column_list[-1]:  # if not last column
-                    print(',', end='', file=file)
-                else:  # last column
-                    print('', file=file)
+        # write out the header
+        file.write(','.join(headings) + '\n')
 
-        if generate_totals:
-            for (column_name, column_heading, column_type) in column_list:
-                if column_type == 'float':
-                    print("%.2f" % float(totals[column_name]), end='', file=file)
-                elif column_name == column_list[0][0]:  # if the first column
-                    print('Total', end='', file=file)
+        # write out all the records with a single call
+        file.writelines(formatted_lines())
 
-                if column_name != column_list[-1][0]:  # if not last column
-                    print(',', end='', file=file)
-                else:  # last column
-                    print('', file=file)
+        if generate_totals:
+            cells = []
+            for index, (name, float_column) in enumerate(zip(names, is_float)):
+                if float_column:
+                    cells.append("%.2f" % totals[name])
+                elif index == 0:  # if the first column
+                    cells.append('Total')
+                else:
+                    cells.append('')
+            file.write(','.join(cells) + '\n')
 
 
 class TableBuilder:
@@ -388,35 +498,41 @@ class TableBuilder:
 
     def __init__(self):
         """Initialize the class."""
-        self.data = []
+        self.columns = []  # the table is stored by column, and turned into rows on request
+        self.table = None  # rows built from the columns, cached until another column is added
 
     def add(self, column, cell=None):
-        """Add a column to the table.  column is a list of values to be added."""
-        if cell is None:
-            column_to_add = column
-        else:
-            column_to_add = list(column)
+        """Add a column to the table.  column is a list of values to be added; cell, if given, is put at the top."""
+        column_to_add = list(column)
+        if cell is not None:
             column_to_add.insert(0, cell)
+        self.columns.append(column_to_add)
+        self.table = None
 
-        if self.data == []:
-            for item in column_to_add:
-                self.data.append([item])
-        else:
-            for index, item in enumerate(column_to_add):
-                self.data[index].append(item)
+    def rows(self):
+        """Return the table as a list of rows; short columns are padded with empty cells.
 
+        The rows are built once and the same list is returned until another column is added.
+        """
+        if self.table is None:
+            self.table = [list(row) for row in zip_longest(*self.columns, fillvalue='')]
+        return self.table
+
+    @property
     def data(self):
-        """Return the table."""
-        return self.data
+        """Return the table as a list of rows (same as rows())."""
+        return self.rows()
 
 
 class S3Initializer:
     """Parent class that sets up S3 bucket access for a bound S3 service or bucket defined in aws.cfg."""
 
+    _client_cache = {}  # (access_key_id, secret_access_key) -> boto3 s3 client, shared by all instances
+
     def __init__(self, s3_only):
         """Initialize the class."""
         self.s3_only = s3_only
-        if os.environ.get('VCAP_SERVICES') is not None:  # not running locally
+        if _VCAP_SERVICES is not None:  # not running locally
             s3_service = get_service_from_vcap_services('aws-s3')
             credentials = s3_service['credentials']
             self.access_key_id = credentials['access_key_id']
@@ -440,10 +556,16 @@ class S3Initializer:
             exit(1)
 
     def get_s3_client(self):
-        """Return a boto3 s3 client."""
-        return boto3.client('s3',
-                            aws_access_key_id=self.access_key_id,
-                            aws_secret_access_key=self.secret_access_key)
+        """Return a boto3 s3 client, reusing the client already created for these credentials if there is one."""
+        key = (self.access_key_id, self.secret_access_key)
+        s3_client = S3Initializer._client_cache.get(key)
+        if s3_client is None:
+            s3_client = boto3.client('s3',
+                                     aws_access_key_id=self.access_key_id,
+                                     aws_secret_access_key=self.secret_access_key,
+                                     config=_S3_CONFIG)
+            S3Initializer._client_cache[key] = s3_client
+        return s3_client
 
 
 class FileManager(S3Initializer):
@@ -472,9 +594,9 @@ class FileManager(S3Initializer):
                     yield s3_object['Key']
 
         else:  # No S3 bucket, so provide a list of files in the current directory
-            files = os.listdir('.')
-            for file in files:
-                yield file
+            with os.scandir('.') as entries:
+                for entry in entries:
+                    yield entry.name
 
     def files_present(self, prefix=None):
         """Indicate if any files are present in the S3 bucket.  The prefix is applied if supplied."""
@@ -494,6 +616,55 @@ class FileManager(S3Initializer):
             else:
                 return 0
 
+    def bulk_exists(self, filenames):
+        """Return the set of filenames that are present, listing the S3 bucket once per 2-character prefix."""
+        if not hasattr(self, 'bucket'):  # No S3 bucket, so check the current directory
+            return {filename for filename in filenames if file_exists(filename)}
+
+        wanted = defaultdict(set)  # 2-character prefix -> filenames with that prefix
+        for filename in filenames:
+            wanted[filename[:2]].add(filename)
+
+        present = set()
+        s3_client = self.get_s3_client()
+        paginator = s3_client.get_paginator('list_objects_v2')
+        for prefix, prefix_filenames in wanted.items():
+            for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+                for s3_object in page.get('Contents', []):
+                    if s3_object['Key'] in prefix_filenames:
+                        present.add(s3_object['Key'])
+        return present
+
+    def download_many(self, filenames, dest_dir=None, max_workers=16):
+        """Download the specified files from the S3 bucket into dest_dir concurrently; return the local paths.
+
+        If no S3 bucket is defined, the files are copied from the current directory instead.
+        dest_dir defaults to the current directory.  Each file is downloaded as a single stream, so max_workers is
+        the number of S3 connections used, and should not exceed the client's pool size (50).
+        """
+        if dest_dir is None:
+            dest_dir = '.'
+        filenames = list(filenames)
+        paths = [os.path.join(dest_dir, filename) for filename in filenames]
+        for path in paths:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+        if not hasattr(self, 'bucket'):  # No S3 bucket, so copy the local files
+            for filename, path in zip(filenames, paths):
+                if os.path.abspath(filename) != os.path.abspath(path):
+                    shutil.copy2(filename, path)
+            return paths
+
+        print('Downloading', len(paths), 'files from S3 bucket', self.bucket)
+        s3_client = self.get_s3_client()  # boto3 clients are thread safe, so all threads share the cached client
+
+        def download(filename, path):
+            s3_client.download_file(self.bucket, filename, path, Config=_S3_SINGLE_STREAM_CONFIG)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(download, filenames, paths))
+        return paths
+
     def delete(self, filename):
         """Delete the file with name 'filename'."""
         s3_client = self.get_s3_client()
@@ -503,10 +674,15 @@ class FileManager(S3Initializer):
 class S3Reader(S3Initializer):
     """S3Reader behaves very much like a file object, except it reads the file from an S3 bucket (if defined)."""
 
-    def __init__(self, filename, s3_only=None, suppress_file_not_found=None):
-        """Initialize the class by saving the filename."""
+    def __init__(self, filename, s3_only=None, suppress_file_not_found=None, known_present=None):
+        """Initialize the class by saving the filename.
+
+        known_present is an optional set of filenames known to be in the S3 bucket (see FileManager.bulk_exists);
+        when supplied, files not in it are reported as not found without contacting S3.
+        """
         self.filename = filename
         self.suppress_file_not_found = suppress_file_not_found
+        self.known_present = known_present
         super().__init__(s3_only)
         if not hasattr(self, 'bucket'):  # running locally
             print('VCAP_SERVICES not defined, aws.cfg not present...reading file', self.filename, 'locally.')
@@ -515,23 +691,26 @@ class S3Reader(S3Initializer):
         """Open a connection to S3, download the file locally, and open the file."""
         if hasattr(self, 'bucket'):  # Make sure the bucket atttribute is present
             # make sure the requested file is not already present
-            if not os.path.exists(self.filename) or not os.path.isfile(self.filename) or self.s3_only:
+            if not file_exists(self.filename) or self.s3_only:
                 print('Reading file', self.filename, 'from S3 bucket', self.bucket)
                 s3_client = self.get_s3_client()
 
-                try:
-                    s3_client.head_object(Bucket=self.bucket, Key=self.filename)
-                except ClientError as e:
-                    if e.response['Error']['Code'] == '404':
-                        print('Did not find file', self.filename, 'locally or in S3 bucket', self.bucket)
-                        if self.suppress_file_not_found:
-                            return None
+                # download directly (no separate existence check), treating a 404 as file not found
+                found = self.known_present is None or self.filename in self.known_present
+                if found:
+                    try:
+                        s3_client.download_file(self.bucket, self.filename, self.filename)
+                    except ClientError as e:
+                        if e.response['Error']['Code'] in ('404', 'NoSuchKey'):
+                            found = False
                         else:
-                            exit(1)
+                            raise
+                if not found:
+                    print('Did not find file', self.filename, 'locally or in S3 bucket', self.bucket)
+                    if self.suppress_file_not_found:
+                        return None
                     else:
-                        raise
-
-                s3_client.download_file(self.bucket, self.filename, self.filename)
+                        exit(1)
         self.file = open(self.filename, 'r')
         return self.file
 
@@ -550,18 +729,20 @@ class CsvReader(S3Initializer):
         super().__init__(s3_only=None)
         self.filename = csv_filename
         if hasattr(self, 'bucket'):  # Make sure the bucket atttribute is present
-            if not os.path.exists(self.filename) or not os.path.isfile(self.filename):
+            if not file_exists(self.filename):
                 print('Copying file', self.filename, 'from S3 bucket', self.bucket)
                 s3_client = self.get_s3_client()
                 s3_client.download_file(self.bucket, self.filename, self.filename)
 
     def __enter__(self):
         """Open the file for reading; read and process the header line."""
-        self.file = open(self.filename, 'r')
-        self.header = self.file.readline().strip()
-        self.column_names = self.header.split(',')
+        self.file = open(self.filename, 'r', newline='')
+        self.current_line = ''
+        self.csv_reader = csv.reader(self.file_lines())
+        self.column_names = next(self.csv_reader, [])
+        self.header = self.current_line
         self.column_index = {}
-        for num, column_name in enumerate(self.header.split(',')):
+        for num, column_name in enumerate(self.column_names):
             self.column_index[column_name] = num
         return self
 
@@ -574,13 +755,23 @@ class CsvReader(S3Initializer):
         """Return a list of the column names."""
         return self.column_names
 
+    def file_lines(self):
+        """Return a stream of the raw lines of the file, saving each stripped line as current_line (generator)."""
+        for line in self.file:
+            self.current_line = line.strip()
+            yield line
+
     def readlines(self):
         """Return a stream of the lines in the csv file (generator)."""
-        for line in self.file.readlines():
-            current_line = line.strip()
-            self.current_line = current_line
-            self.words = current_line.split(',')
-            yield current_line
+        for row in self.csv_reader:
+            self.words = row
+            yield self.current_line
+
+    def rows(self):
+        """Return a stream of the rows in the csv file, each a list of fields (generator)."""
+        for row in self.csv_reader:
+            self.words = row
+            yield row
 
     def columns(self):
         """Returns the columns for the current line."""
@@ -592,6 +783,13 @@ class CsvReader(S3Initializer):
             print('Did not find column name', column_name, 'in csv file', self.filename)
         return self.words[self.column_index[column_name]]
 
+    def column_pos(self, column_name):
+        """Return the 0-based position of column_name, for indexing the rows returned by rows() directly."""
+        if column_name not in self.column_index:
+            print('Did not find column name', column_name, 'in csv file', self.filename)
+            exit()
+        return self.column_index[column_name]
+
     def column_by_number(self, column_number):
         """Return the data field in the current line of the csv file that matches column_number."""
         if int(column_number) > len(self.words):
@@ -659,23 +857,20 @@ class CsvWriter(S3Initializer):
     def __init__(self, filename, header=None):
         """Initialize the class."""
         self.filename = filename
-        self.current_line = ''
-        self.lines = []
+        self.values = []  # values of the current line
         self.header = header
         super().__init__(s3_only=None)
 
     def __enter__(self):
-        """Open the file for writing."""
+        """Open the file for writing, and write the header (if any)."""
         self.file = open(self.filename, 'w')
+        if self.header:
+            self.file.write(self.header + '\n')
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Write the file, and upload to S3 if bucket is defined."""
+        """Close the file, and upload to S3 if bucket is defined."""
         if self.file:
-            if self.header:
-                print(self.header, file=self.file)
-            for line in self.lines:
-                print(line, file=self.file)
             self.file.close()
             if hasattr(self, 'bucket'):  # Make sure the bucket atttribute is present
                 print('Writing file', self.filename, 'to S3 bucket', self.bucket)
@@ -683,22 +878,15 @@ class CsvWriter(S3Initializer):
                 s3_client.upload_file(self.filename, self.bucket, self.filename)
 
     def add_value(self, value):
-        """Add a single value to the current line, prepending a comma if this is not the first value."""
-        # if the current line is empty
-        if self.current_line == '':
-            # put the value in the current line
-            self.current_line = value
-        else:  # current line is not empty
-            # append a comma to the current line, followed by the value
-            self.current_line = self.current_line + ',' + value
+        """Add a single value to the current line."""
+        self.values.append(value)
 
     def add_values(self, value_list):
         """Add a list of values to the current line."""
-        if len(value_list) > 0:
-            for value in value_list:
-                self.add_value(str(value))
+        for value in value_list:
+            self.add_value(str(value))
 
     def new_line(self):
-        """Add a new line to the csv file."""
-        self.lines.append(self.current_line)
-        self.current_line = ''
+        """Write the current line to the csv file, and start a new line."""
+        self.file.write(','.join(self.values) + '\n')
+        self.values = []
@@ -4,7 +4,10 @@
 """
 
 import os
-import json
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional; fall back to the standard library decoder
+    from json import loads as json_loads
 from flask import Flask, render_template
 
 app = Flask(__name__)
@@ -13,24 +16,29 @@ port = os.getenv("PORT", "5000")
 
 
 def get_creds():
-    env_vars = os.environ['VCAP_SERVICES']
-    env_vars_json = json.loads(env_vars)
-    first_service_type = next(iter(env_vars_json.values()))
-    print(first_service_type)
+    env_vars = os.environ.get('VCAP_SERVICES')
+    if not env_vars:
+        return {}
+    env_vars_json = json_loads(env_vars)
+    first_service_type = next(iter(env_vars_json.values()), None)
+    if first_service_type is None:  # no services bound
+        return {}
     return first_service_type[0]['credentials']
     # for svc_name in env_vars_json:
         # print(svc_name, env_vars_json[svc_name][0], env_vars_json[svc_name][0]['credentials'])
         # for cred in env_vars_json[svc_name][0]['credentials']:
         #     print(cred, env_vars_json[svc_name][0]['credentials'][cred])
 
+# VCAP_SERVICES does not change while the app is running, so look up the creds once rather than per request
+_CREDS = get_creds()
+
 @app.route("/")
 def index():
     return "hello world"
 
 @app.route("/showme")
 def showme():
-    creds = get_creds()
-    return render_template('showme.html', creds=creds)
+    return render_template('showme.html', creds=_CREDS)
 
 
 if __name__ == '__main__':